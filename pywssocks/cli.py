@@ -118,7 +118,7 @@ def _client_cli(
     """Start SOCKS5 over WebSocket proxy client"""
 
     from pywssocks.client import WSSocksClient
-    from pywssocks.common import init_logging
+    from pywssocks.common import init_logging, install_uvloop
 
     async def main():
         init_logging(level=logging.DEBUG if debug else logging.INFO)
@@ -151,6 +151,7 @@ def _client_cli(
             await client.add_connector(connector_token)
         return await task
 
+    install_uvloop()
     asyncio.run(main())
 
 
@@ -231,7 +232,7 @@ def _server_cli(
     """Start SOCKS5 over WebSocket proxy server"""
 
     from pywssocks.server import WSSocksServer
-    from pywssocks.common import init_logging
+    from pywssocks.common import init_logging, install_uvloop
 
     async def main():
         init_logging(level=logging.DEBUG if debug else logging.INFO)
@@ -300,6 +301,7 @@ def _server_cli(
         return await server.serve()
 
     # Start server
+    install_uvloop()
     asyncio.run(main())
 
 
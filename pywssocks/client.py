@@ -8,6 +8,7 @@ from urllib.parse import urlparse, urlunparse
 from websockets.exceptions import ConnectionClosed
 from websockets.asyncio.client import ClientConnection, connect
 
+from pywssocks.common import wait_tasks
 from pywssocks.relay import Relay
 from pywssocks import __version__
 from .message import (
@@ -328,7 +329,7 @@ class WSSocksClient(Relay):
                         finally:
                             for task in tasks:
                                 task.cancel()
-                            await asyncio.gather(*tasks, return_exceptions=True)
+                            await wait_tasks(tasks)
                 except ConnectionClosed:
                     if self._reconnect:
                         self._log.error(
@@ -423,7 +424,7 @@ class WSSocksClient(Relay):
                         finally:
                             for task in tasks:
                                 task.cancel()
-                            await asyncio.gather(*tasks, return_exceptions=True)
+                            await wait_tasks(tasks)
 
                 except ConnectionClosed:
                     if self._reconnect:
@@ -1,5 +1,7 @@
-from typing import Iterable, Optional
+from typing import Coroutine, Iterable, Optional, Set
+import asyncio
 import logging
+import sys
 import threading
 import random
 
@@ -69,3 +71,62 @@ def init_logging(level: int = logging.INFO):
 
     if level >= logging.INFO:
         logging.getLogger("websockets.server").setLevel(logging.WARNING)
+
+
+def install_uvloop() -> bool:
+    """Use uvloop as the asyncio event loop policy if it is installed.
+
+    Must be called before the event loop is created (e.g. before asyncio.run).
+
+    Returns:
+        bool: True if uvloop is used, False if it is unavailable on this platform.
+    """
+
+    if sys.platform == "win32":
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+async def wait_tasks(tasks: Iterable[asyncio.Task]) -> None:
+    """Wait for tasks to finish and retrieve their exceptions.
+
+    Unlike asyncio.wait, this marks exceptions as retrieved so asyncio does not log
+    "Task exception was never retrieved" for tasks failing during teardown.
+
+    Args:
+        tasks: The tasks to wait for, usually already cancelled.
+    """
+
+    tasks = tuple(tasks)
+    if not tasks:
+        return
+    await asyncio.wait(tasks)
+    for task in tasks:
+        if not task.cancelled():
+            task.exception()
+
+
+def create_tracked_task(coro: Coroutine, tasks: Set[asyncio.Task]) -> asyncio.Task:
+    """Start a task and keep it in a tracking set until it is done.
+
+    The set holds a strong reference so the task is not garbage collected
+    while running, and lets the owner cancel whatever is still pending on teardown.
+
+    Args:
+        coro: The coroutine to run.
+        tasks: The set the task is added to and removed from once finished.
+
+    Returns:
+        asyncio.Task: The created task.
+    """
+
+    task = asyncio.create_task(coro)
+    tasks.add(task)
+    task.add_done_callback(tasks.discard)
+    return task
@@ -180,7 +180,38 @@ def pack_message(msg: BaseMessage) -> bytes:
     # Start with version
     result = bytearray([PROTOCOL_VERSION])
 
-    if isinstance(msg, AuthMessage):
+    # Data messages make up most of the traffic, so they are checked first
+    if isinstance(msg, DataMessage):
+        result.append(BinaryType.DATA)
+        result.append(protocol_to_bytes(msg.protocol))
+        result.extend(msg.channel_id.bytes)
+
+        # Handle compression
+        compressed_data = msg.data
+        compression = msg.compression
+        if compression == DATA_COMPRESSION_GZIP:
+            buf = io.BytesIO()
+            with gzip.GzipFile(fileobj=buf, mode="wb") as gz:
+                gz.write(msg.data)
+            compressed_data = buf.getvalue()
+
+        result.append(compression)
+        result.extend(struct.pack(">I", len(compressed_data)))
+        result.extend(compressed_data)
+
+        if msg.protocol == "udp":
+            result.append(len(msg.address) if msg.address else 0)
+            if msg.address:
+                result.extend(msg.address.encode())
+            result.extend(struct.pack(">H", msg.port if msg.port is not None else 0))
+            result.append(len(msg.target_addr) if msg.target_addr else 0)
+            if msg.target_addr:
+                result.extend(msg.target_addr.encode())
+            result.extend(
+                struct.pack(">H", msg.target_port if msg.target_port is not None else 0)
+            )
+
+    elif isinstance(msg, AuthMessage):
         result.append(BinaryType.AUTH)
         result.append(len(msg.token))
         result.extend(msg.token.encode())
@@ -213,36 +244,6 @@ def pack_message(msg: BaseMessage) -> bytes:
             result.append(len(msg.error))
             result.extend(msg.error.encode())
 
-    elif isinstance(msg, DataMessage):
-        result.append(BinaryType.DATA)
-        result.append(protocol_to_bytes(msg.protocol))
-        result.extend(msg.channel_id.bytes)
-
-        # Handle compression
-        compressed_data = msg.data
-        compression = msg.compression
-        if compression == DATA_COMPRESSION_GZIP:
-            buf = io.BytesIO()
-            with gzip.GzipFile(fileobj=buf, mode="wb") as gz:
-                gz.write(msg.data)
-            compressed_data = buf.getvalue()
-
-        result.append(compression)
-        result.extend(struct.pack(">I", len(compressed_data)))
-        result.extend(compressed_data)
-
-        if msg.protocol == "udp":
-            result.append(len(msg.address) if msg.address else 0)
-            if msg.address:
-                result.extend(msg.address.encode())
-            result.extend(struct.pack(">H", msg.port if msg.port is not None else 0))
-            result.append(len(msg.target_addr) if msg.target_addr else 0)
-            if msg.target_addr:
-                result.extend(msg.target_addr.encode())
-            result.extend(
-                struct.pack(">H", msg.target_port if msg.target_port is not None else 0)
-            )
-
     elif isinstance(msg, DisconnectMessage):
         result.append(BinaryType.DISCONNECT)
         result.extend(msg.channel_id.bytes)
@@ -282,7 +283,54 @@ def parse_message(data: bytes) -> BaseMessage:
     msg_type = data[1]
     payload = data[2:]
 
-    if msg_type == BinaryType.AUTH:
+    # Data messages make up most of the traffic, so they are checked first
+    if msg_type == BinaryType.DATA:
+        if (
+            len(payload) < 22
+        ):  # Protocol(1) + ChannelID(16) + Compression(1) + DataLen(4)
+            raise ValueError("Invalid data message")
+        protocol = bytes_to_protocol(payload[0])
+        channel_id = uuid.UUID(bytes=payload[1:17])
+        compression = payload[17]
+        data_len = struct.unpack(">I", payload[18:22])[0]
+        if len(payload) < 22 + data_len:
+            raise ValueError("Invalid data message length")
+
+        # Handle decompression
+        raw_data = payload[22 : 22 + data_len]
+        if compression == DATA_COMPRESSION_GZIP:
+            with gzip.GzipFile(fileobj=io.BytesIO(raw_data), mode="rb") as gz:
+                decompressed_data = gz.read()
+        else:
+            decompressed_data = raw_data
+
+        msg = DataMessage(
+            protocol=protocol,
+            channel_id=channel_id,
+            compression=compression,
+            data=decompressed_data,
+        )
+
+        if protocol == "udp":
+            payload = payload[22 + data_len :]
+            if len(payload) < 1:
+                raise ValueError("Invalid udp data message")
+            addr_len = payload[0]
+            if len(payload) < 1 + addr_len + 2 + 1:
+                raise ValueError("Invalid udp data message length")
+            msg.address = payload[1 : 1 + addr_len].decode()
+            msg.port = struct.unpack(">H", payload[1 + addr_len : 1 + addr_len + 2])[0]
+            payload = payload[1 + addr_len + 2 :]
+            target_addr_len = payload[0]
+            if len(payload) < 1 + target_addr_len + 2:
+                raise ValueError("Invalid udp data message target address")
+            msg.target_addr = payload[1 : 1 + target_addr_len].decode()
+            msg.target_port = struct.unpack(
+                ">H", payload[1 + target_addr_len : 1 + target_addr_len + 2]
+            )[0]
+        return msg
+
+    elif msg_type == BinaryType.AUTH:
         if len(payload) < 1:
             raise ValueError("Invalid auth message")
         token_len = payload[0]
@@ -342,52 +390,6 @@ def parse_message(data: bytes) -> BaseMessage:
             success=success, channel_id=channel_id, error=error
         )
 
-    elif msg_type == BinaryType.DATA:
-        if (
-            len(payload) < 22
-        ):  # Protocol(1) + ChannelID(16) + Compression(1) + DataLen(4)
-            raise ValueError("Invalid data message")
-        protocol = bytes_to_protocol(payload[0])
-        channel_id = uuid.UUID(bytes=payload[1:17])
-        compression = payload[17]
-        data_len = struct.unpack(">I", payload[18:22])[0]
-        if len(payload) < 22 + data_len:
-            raise ValueError("Invalid data message length")
-
-        # Handle decompression
-        raw_data = payload[22 : 22 + data_len]
-        if compression == DATA_COMPRESSION_GZIP:
-            with gzip.GzipFile(fileobj=io.BytesIO(raw_data), mode="rb") as gz:
-                decompressed_data = gz.read()
-        else:
-            decompressed_data = raw_data
-
-        msg = DataMessage(
-            protocol=protocol,
-            channel_id=channel_id,
-            compression=compression,
-            data=decompressed_data,
-        )
-
-        if protocol == "udp":
-            payload = payload[22 + data_len :]
-            if len(payload) < 1:
-                raise ValueError("Invalid udp data message")
-            addr_len = payload[0]
-            if len(payload) < 1 + addr_len + 2 + 1:
-                raise ValueError("Invalid udp data message length")
-            msg.address = payload[1 : 1 + addr_len].decode()
-            msg.port = struct.unpack(">H", payload[1 + addr_len : 1 + addr_len + 2])[0]
-            payload = payload[1 + addr_len + 2 :]
-            target_addr_len = payload[0]
-            if len(payload) < 1 + target_addr_len + 2:
-                raise ValueError("Invalid udp data message target address")
-            msg.target_addr = payload[1 : 1 + target_addr_len].decode()
-            msg.target_port = struct.unpack(
-                ">H", payload[1 + target_addr_len : 1 + target_addr_len + 2]
-            )[0]
-        return msg
-
     elif msg_type == BinaryType.DISCONNECT:
         if len(payload) < 16:  # ChannelID(16)
             raise ValueError("Invalid disconnect message")
@@ -1,5 +1,6 @@
 from typing import Dict, Optional
 import asyncio
+import json
 import logging
 import socket
 import uuid
@@ -15,9 +16,13 @@ from .message import (
     ConnectMessage,
     parse_message,
 )
+from .common import wait_tasks
 
 _default_logger = logging.getLogger(__name__)
 
+# Upper bound of queued TCP payloads combined into a single socket write
+MAX_BATCH_BYTES = 64 * 1024
+
 
 class UDPProtocol(asyncio.DatagramProtocol):
     """UDP protocol handler with send and receive queues"""
@@ -148,17 +153,13 @@ class Relay:
         if not self._log.isEnabledFor(logging.DEBUG):
             return
 
-        # Create a copy of message data for logging
+        # Create a shallow copy of message data for logging, only top-level keys are replaced
         try:
-            import json
-            import copy
-            from uuid import UUID
-
-            msg_copy = copy.deepcopy(msg.__dict__)
+            msg_copy = dict(msg.__dict__)
 
             # Convert all UUID objects to strings
             for key, value in msg_copy.items():
-                if isinstance(value, UUID):
+                if isinstance(value, uuid.UUID):
                     msg_copy[key] = str(value)
 
             # Remove sensitive fields and add data length
@@ -607,7 +608,7 @@ class Relay:
         finally:
             for task in tasks:
                 task.cancel()
-            await asyncio.gather(*tasks, return_exceptions=True)
+            await wait_tasks(tasks)
 
     async def _tcp_to_websocket(
         self, websocket: Connection, tcp_socket: socket.socket, channel_id: str
@@ -636,10 +637,23 @@ class Relay:
         loop = asyncio.get_running_loop()
         while True:
             msg_data = await queue.get()
-            if isinstance(msg_data, DataMessage):
-                binary_data = msg_data.data
-                await loop.sock_sendall(tcp_socket, binary_data)
-                self._log.debug(f"Sent TCP data to target: size={len(binary_data)}.")
+            if not isinstance(msg_data, DataMessage):
+                continue
+
+            # Combine data which is already queued into a single write
+            chunks = [msg_data.data]
+            size = len(msg_data.data)
+            while size < MAX_BATCH_BYTES and not queue.empty():
+                msg_data = queue.get_nowait()
+                if isinstance(msg_data, DataMessage):
+                    chunks.append(msg_data.data)
+                    size += len(msg_data.data)
+
+            binary_data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+            await loop.sock_sendall(tcp_socket, binary_data)
+            self._log.debug(
+                f"Sent TCP data to target: size={size} messages={len(chunks)}."
+            )
 
     async def _handle_remote_tcp_forward(
         self, websocket: Connection, remote_socket: socket.socket, channel_id: str
@@ -673,7 +687,7 @@ class Relay:
         finally:
             for task in tasks:
                 task.cancel()
-            await asyncio.gather(*tasks, return_exceptions=True)
+            await wait_tasks(tasks)
 
     async def _handle_socks_tcp_forward(
         self, websocket: Connection, socks_socket: socket.socket, channel_id: str
@@ -713,7 +727,7 @@ class Relay:
             finally:
                 for task in tasks:
                     task.cancel()
-                await asyncio.gather(*tasks, return_exceptions=True)
+                await wait_tasks(tasks)
 
         finally:
             # Send disconnect message when connection is closed
@@ -766,7 +780,7 @@ class Relay:
             finally:
                 for task in tasks:
                     task.cancel()
-                await asyncio.gather(*tasks, return_exceptions=True)
+                await wait_tasks(tasks)
 
         finally:
             # Send disconnect message when connection is closed
@@ -894,11 +908,13 @@ class Relay:
     async def _sendto(self, sock: socket.socket, data, address):
         loop = asyncio.get_running_loop()
 
-        # Use fallback for Python <= 3.10
+        # Use fallback for Python <= 3.10 and for loops without it (e.g. uvloop)
         if hasattr(loop, "sock_sendto"):
-            return await loop.sock_sendto(sock, data, address)
-        else:
-            return sock.sendto(data, address)
+            try:
+                return await loop.sock_sendto(sock, data, address)
+            except NotImplementedError:
+                pass
+        return sock.sendto(data, address)
 
     async def _connect_via_socks5(
         self, target_addr: str, target_port: int
@@ -1,11 +1,11 @@
 from http import HTTPStatus
-from typing import Iterable, Optional, Tuple, Union
+from typing import Iterable, Iterator, Optional, Tuple, Union
 import logging
 import asyncio
-import json
+import os
 import socket
-import random
-import string
+import secrets
+import itertools
 from uuid import UUID, uuid4
 from dataclasses import dataclass
 
@@ -15,7 +15,7 @@ from websockets.http11 import Request
 from websockets.exceptions import ConnectionClosed
 from websockets.asyncio.server import ServerConnection, serve
 
-from pywssocks.common import PortPool
+from pywssocks.common import PortPool, create_tracked_task, wait_tasks
 from pywssocks.relay import Relay
 from pywssocks import __version__
 from .message import (
@@ -33,6 +33,12 @@ from .message import (
 
 _default_logger = logging.getLogger(__name__)
 
+# Auth responses never change, so they are packed only once
+_AUTH_SUCCESS_MSG = AuthResponseMessage(success=True, error=None)
+_AUTH_SUCCESS_DATA = pack_message(_AUTH_SUCCESS_MSG)
+_AUTH_INVALID_MSG = AuthResponseMessage(success=False, error="Invalid token")
+_AUTH_INVALID_DATA = pack_message(_AUTH_INVALID_MSG)
+
 
 @dataclass
 class TokenOptions:
@@ -102,56 +108,98 @@ class SocketManager:
     """Manages server sockets with reuse capability"""
 
     def __init__(
-        self, host: str, grace: float = 30, logger: Optional[logging.Logger] = None
+        self,
+        host: str,
+        grace: float = 30,
+        workers: int = 1,
+        logger: Optional[logging.Logger] = None,
     ):
         """
         Args:
             host: Listen address for servers
+            grace: Grace time in seconds before closing released sockets
+            workers: Number of sockets bound to each port, each with its own accept loop.
+                Values above 1 use SO_REUSEPORT (ignored where unavailable), which lets
+                any other process of the same user bind the port too and silently take
+                a share of the connections, so a port conflict is no longer reported.
         """
         self._host = host
         self._grace = grace
-        self._sockets: dict[int, tuple[socket.socket, float, int]] = (
+        if not hasattr(socket, "SO_REUSEPORT"):
+            workers = 1
+        self._workers = max(workers, 1)
+        self._sockets: dict[int, tuple[list[socket.socket], float, int]] = (
             {}
-        )  # port -> (socket, timestamp, refs)
+        )  # port -> (sockets, timestamp, refs)
         self._lock = asyncio.Lock()
         self._cleanup_tasks: set[asyncio.Task] = set()
         self._log = logger or _default_logger
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
-    async def get_socket(self, port: int) -> socket.socket:
-        """Get a socket for the specified port, reusing existing one if available
+    def _create_socket(self, port: int) -> socket.socket:
+        """Create a listening socket, allowing several of them to share the port"""
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            # SO_REUSEADDR on Windows allows stealing a bound port, so skip it there
+            if os.name != "nt":
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self._workers > 1:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.bind((self._host, port))
+            # The backlog is set once; reuse and release never call listen() again
+            sock.listen(128)
+            sock.setblocking(False)
+        except:
+            sock.close()
+            raise
+        return sock
+
+    async def get_sockets(self, port: int) -> list[socket.socket]:
+        """Get the sockets for the specified port, reusing existing ones if available
 
         Args:
-            port: Port number for the socket
+            port: Port number for the sockets
 
         Returns:
-            socket.socket: Socket bound to the specified port
+            list[socket.socket]: Sockets bound to the specified port, the kernel
+                distributes incoming connections across them
         """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+
         async with self._lock:
-            # Check if we have an existing socket
+            # Check if we have existing sockets
             if port in self._sockets:
-                sock, timestamp, refs = self._sockets[port]
-                self._sockets[port] = (sock, timestamp, refs + 1)
-                sock.listen(1)
+                socks, timestamp, refs = self._sockets[port]
+                # The new accept loops pick up connections queued during the grace period
+                self._sockets[port] = (socks, timestamp, refs + 1)
                 self._log.debug(
                     f"Reusing existing socket for port {port} (refs: {refs + 1})"
                 )
-                return sock
-
-            # Create new socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.bind((self._host, port))
-            sock.listen(5)
-            sock.setblocking(False)
+                return socks
 
-            self._sockets[port] = (sock, 0, 1)
-            self._log.debug(f"New socket allocated on {self._host}:{port}")
-            return sock
+            # Create new sockets
+            socks = []
+            try:
+                for _ in range(self._workers):
+                    socks.append(self._create_socket(port))
+            except:
+                for sock in socks:
+                    sock.close()
+                raise
+
+            self._sockets[port] = (socks, 0, 1)
+            self._log.debug(
+                f"New socket allocated on {self._host}:{port} (workers: {len(socks)})"
+            )
+            return socks
 
     async def release_socket(self, port: int) -> None:
-        """Release a socket, starting 30s grace period for potential reuse
+        """Release the sockets of a port, starting 30s grace period for potential reuse
 
         Args:
-            port: Port number of the socket to release
+            port: Port number of the sockets to release
         """
         async with self._lock:
             if port not in self._sockets:
@@ -160,30 +208,35 @@ class SocketManager:
                 )
                 return
 
-            sock, _, refs = self._sockets[port]
+            socks, _, refs = self._sockets[port]
             refs -= 1
 
             if refs <= 0:
                 self._log.debug(f"Starting grace period for socket on port {port}")
-                sock.listen(0)
+                # The accept loops are already cancelled, so nothing accepts during
+                # the grace period: connections queue in the kernel backlog until the
+                # sockets are reused, or are reset when they are closed. This only
+                # clears the reader a cancelled sock_accept leaves behind on Python 3.8
+                for sock in socks:
+                    try:
+                        self._loop.remove_reader(sock.fileno())
+                    except NotImplementedError:  # Proactor event loop on Windows
+                        pass
                 # Start grace period
-                self._sockets[port] = (sock, asyncio.get_event_loop().time(), 0)
-                task = asyncio.create_task(self._cleanup_socket(port))
-                self._cleanup_tasks.add(task)
-                task.add_done_callback(self._cleanup_tasks.discard)
+                self._sockets[port] = (socks, self._loop.time(), 0)
+                create_tracked_task(self._cleanup_socket(port), self._cleanup_tasks)
             else:
                 self._log.debug(f"Released socket on port {port}.")
-                self._sockets[port] = (sock, 0, refs)
+                self._sockets[port] = (socks, 0, refs)
 
     async def _close_socket(self, sock: socket.socket) -> None:
         """Close a single socket safely."""
 
-        loop = asyncio.get_running_loop()
         # Required for Python 3.8:
         #   bpo-85489: sock_accept() does not remove server socket reader on cancellation
         #         url: https://bugs.python.org/issue41317
         try:
-            loop.remove_reader(sock.fileno())
+            self._loop.remove_reader(sock.fileno())
         except:
             pass
         try:
@@ -192,7 +245,7 @@ class SocketManager:
             pass
 
     async def _cleanup_socket(self, port: int) -> None:
-        """Clean up socket after grace period if not reused"""
+        """Clean up sockets after grace period if not reused"""
 
         await asyncio.sleep(self._grace)  # Grace period
 
@@ -200,13 +253,14 @@ class SocketManager:
             if port not in self._sockets:
                 return
 
-            sock, timestamp, refs = self._sockets[port]
+            socks, timestamp, refs = self._sockets[port]
             # Only close if still in grace period (timestamp > 0) and no new refs
             if refs == 0 and timestamp > 0:
                 self._log.debug(
                     f"Cleaning up unused socket on port {port} after grace period"
                 )
-                await self._close_socket(sock)
+                for sock in socks:
+                    await self._close_socket(sock)
                 del self._sockets[port]
 
     async def close(self) -> None:
@@ -218,12 +272,12 @@ class SocketManager:
                 task.cancel()
 
             # Wait for cancellation to complete
-            if self._cleanup_tasks:
-                await asyncio.gather(*self._cleanup_tasks, return_exceptions=True)
+            await wait_tasks(self._cleanup_tasks)
 
             # Close all sockets
-            for port, (sock, _, _) in list(self._sockets.items()):
-                await self._close_socket(sock)
+            for port, (socks, _, _) in list(self._sockets.items()):
+                for sock in socks:
+                    await self._close_socket(sock)
                 del self._sockets[port]
 
 
@@ -246,6 +300,7 @@ class WSSocksServer(Relay):
         socks_port_pool: Union[PortPool, Iterable[int]] = range(1024, 10240),
         socks_wait_client: bool = True,
         socks_grace: float = 30.0,
+        socks_workers: int = 1,
         logger: Optional[logging.Logger] = None,
         **kw,
     ) -> None:
@@ -259,6 +314,8 @@ class WSSocksServer(Relay):
                 otherwise start the SOCKS server when the reverse proxy token is added.
             socks_grace: Grace time in seconds before stopping the SOCKS server after token
                 removal to avoid port re-allocation.
+            socks_workers: Number of SO_REUSEPORT sockets accepting on each SOCKS5 port,
+                see SocketManager for the port sharing caveat.
             logger: Custom logger instance
         """
 
@@ -283,14 +340,17 @@ class WSSocksServer(Relay):
         # Store all connected reverse proxy clients, {client_id: websocket}
         self._clients: dict[UUID, ServerConnection] = {}
 
-        # Protect shared resource for token, {token: lock}
-        self._token_locks: dict[str, asyncio.Lock] = {}
+        # Group reverse proxy clients by token, {token: {client_id: websocket}}
+        self._token_clients: dict[str, dict[UUID, ServerConnection]] = {}
+
+        # Reverse index of _token_clients, {client_id: token}
+        self._client_token: dict[UUID, str] = {}
 
-        # Group reverse proxy clients by token, {token: list of (client_id, websocket) tuples}
-        self._token_clients: dict[str, list[tuple[UUID, ServerConnection]]] = {}
+        # Round-robin over each token's clients, rebuilt on change, {token: cycle of (client_id, websocket)}
+        self._token_cycles: dict[str, Iterator[tuple[UUID, ServerConnection]]] = {}
 
-        # Store current round-robin index for each reverse proxy token for load balancing, {token: current_index}
-        self._token_indexes: dict[str, int] = {}
+        # Set while a reverse proxy token has connected clients, {token: event}
+        self._token_ready_events: dict[str, asyncio.Event] = {}
 
         # Map reverse proxy tokens to their assigned SOCKS5 ports, {token: socks_port}
         self._tokens: dict[str, int] = {}
@@ -316,9 +376,21 @@ class WSSocksServer(Relay):
         # Store token options including auth and permissions
         self._token_options: dict[str, TokenOptions] = {}
 
+        # Track network connection handler tasks of each client, {client_id: tasks}
+        self._network_handler_tasks: dict[UUID, set[asyncio.Task]] = {}
+
+        # Handlers for messages received from clients, {message type: handler}
+        self._msg_handlers = {
+            DataMessage: self._handle_data_message,
+            ConnectResponseMessage: self._handle_connect_response_message,
+            ConnectMessage: self._handle_connect_message,
+            DisconnectMessage: self._handle_disconnect_message,
+            ConnectorMessage: self._handle_connector_message,
+        }
+
         # Manage SOCKS server port allocation
         self._socket_manager = SocketManager(
-            socks_host, grace=socks_grace, logger=self._log
+            socks_host, grace=socks_grace, workers=socks_workers, logger=self._log
         )
 
         # Manage connector connections and channels
@@ -342,8 +414,7 @@ class WSSocksServer(Relay):
             return None
 
         if connector_token is None:
-            chars = string.ascii_letters + string.digits
-            connector_token = "".join(random.choice(chars) for _ in range(16))
+            connector_token = secrets.token_urlsafe(12)
 
         if connector_token in self._connector_tokens:
             return None
@@ -374,22 +445,21 @@ class WSSocksServer(Relay):
             Returns (None, None) if no ports available or port already in use
         """
         if token is None:
-            chars = string.ascii_letters + string.digits
-            token = "".join(random.choice(chars) for _ in range(16))
+            token = secrets.token_urlsafe(12)
 
         if token in self._tokens:
             return token, self._tokens[token]
 
         if allow_manage_connector:
             self._tokens[token] = -1
-            self._token_locks[token] = asyncio.Lock()
+            self._token_ready_events[token] = asyncio.Event()
             port = -1
         else:
             port = self._socks_port_pool.get(port)
             if not port:
                 return None, None
             self._tokens[token] = port
-            self._token_locks[token] = asyncio.Lock()
+            self._token_ready_events[token] = asyncio.Event()
             self._log.info(f"New reverse proxy token added for port {port}.")
         self._token_options[token] = TokenOptions(
             username=username,
@@ -412,8 +482,7 @@ class WSSocksServer(Relay):
             token string
         """
         if token is None:
-            chars = string.ascii_letters + string.digits
-            token = "".join(random.choice(chars) for _ in range(16))
+            token = secrets.token_urlsafe(12)
 
         self._forward_tokens.add(token)
         self._log.info("New forward proxy token added.")
@@ -444,7 +513,7 @@ class WSSocksServer(Relay):
 
             # Close all client connections for this token
             if token in self._token_clients:
-                for client_id, ws in self._token_clients[token]:
+                for client_id, ws in self._token_clients[token].items():
                     if self._loop:
                         try:
                             self._loop.create_task(ws.close(1000, "Token removed"))
@@ -452,7 +521,9 @@ class WSSocksServer(Relay):
                             pass
                     if client_id in self._clients:
                         del self._clients[client_id]
+                    self._client_token.pop(client_id, None)
                 del self._token_clients[token]
+                self._token_cycles.pop(token, None)
 
             # Clean up connector token
             del self._connector_tokens[token]
@@ -466,7 +537,9 @@ class WSSocksServer(Relay):
                 for internal_token in self._internal_tokens[token]:
                     # Clean up internal token data
                     if internal_token in self._token_clients:
-                        for client_id, ws in self._token_clients[internal_token]:
+                        for client_id, ws in self._token_clients[
+                            internal_token
+                        ].items():
                             if self._loop:
                                 try:
                                     self._loop.create_task(
@@ -476,11 +549,11 @@ class WSSocksServer(Relay):
                                     pass
                             if client_id in self._clients:
                                 del self._clients[client_id]
+                            self._client_token.pop(client_id, None)
                         del self._token_clients[internal_token]
+                        self._token_cycles.pop(internal_token, None)
                     if internal_token in self._tokens:
                         del self._tokens[internal_token]
-                    if internal_token in self._token_indexes:
-                        del self._token_indexes[internal_token]
                     if internal_token in self._token_options:
                         del self._token_options[internal_token]
                 del self._internal_tokens[token]
@@ -496,7 +569,7 @@ class WSSocksServer(Relay):
 
             # Close all client connections for this token
             if token in self._token_clients:
-                for client_id, ws in self._token_clients[token]:
+                for client_id, ws in self._token_clients[token].items():
                     if self._loop:
                         try:
                             self._loop.create_task(ws.close(1000, "Token removed"))
@@ -504,15 +577,15 @@ class WSSocksServer(Relay):
                             pass
                     if client_id in self._clients:
                         del self._clients[client_id]
+                    self._client_token.pop(client_id, None)
                 del self._token_clients[token]
+                self._token_cycles.pop(token, None)
 
             # Clean up token related data
             port = self._tokens[token]
             del self._tokens[token]
-            if token in self._token_locks:
-                del self._token_locks[token]
-            if token in self._token_indexes:
-                del self._token_indexes[token]
+            if token in self._token_ready_events:
+                del self._token_ready_events[token]
             if token in self._token_options:
                 del self._token_options[token]
             try:
@@ -605,41 +678,69 @@ class WSSocksServer(Relay):
     async def _get_next_websocket(self, token: str) -> Optional[ServerConnection]:
         """Get next available WebSocket connection using round-robin"""
 
-        lock = self._token_locks[token]
-        async with lock:
-            if token not in self._token_clients or not self._token_clients[token]:
-                return None
+        # No lock needed: nothing is awaited between looking up the cycle and
+        # advancing it, and it is replaced as a whole when clients change.
+        clients = self._token_cycles.get(token)
+        if clients is None:
+            return None
 
-            clients = self._token_clients[token]
-            if not clients:
-                return None
+        client_id, websocket = next(clients)
+        self._log.debug(f"Handling request using client {client_id}.")
+        return websocket
 
-            current_index = self._token_indexes.get(token, 0)
-            self._token_indexes[token] = current_index = (current_index + 1) % len(
-                clients
-            )
+    def _add_token_client(
+        self, token: str, client_id: UUID, websocket: ServerConnection
+    ) -> None:
+        """Register a client under a token and refresh its round-robin snapshot"""
 
-        self._log.debug(
-            f"Handling request using client index for this client: {current_index}"
-        )
-        try:
-            return clients[current_index][1]
-        except:
-            return clients[0][1]
+        clients = self._token_clients.setdefault(token, {})
+        clients[client_id] = websocket
+        self._client_token[client_id] = token
+        # Copy-on-write: readers keep using the old snapshot until it is replaced
+        self._token_cycles[token] = itertools.cycle(tuple(clients.items()))
+
+        ready = self._token_ready_events.get(token)
+        if ready:
+            ready.set()
+
+    def _remove_token_client(self, client_id: UUID) -> None:
+        """Unregister a client from its token and refresh the round-robin snapshot"""
+
+        token = self._client_token.pop(client_id, None)
+        if token is None:
+            return
+
+        clients = self._token_clients.get(token)
+        if clients is None:
+            return
+
+        clients.pop(client_id, None)
+        if clients:
+            self._token_cycles[token] = itertools.cycle(tuple(clients.items()))
+        else:
+            # Clean up resources if no connections left for this token
+            del self._token_clients[token]
+            self._token_cycles.pop(token, None)
+
+            ready = self._token_ready_events.get(token)
+            if ready:
+                ready.clear()
 
     async def _handle_socks_request(
         self, socks_socket: socket.socket, addr: str, token: str
     ) -> None:
+        token_clients = self._token_clients
+
         # Check if token has valid clients
-        if token not in self._token_clients:
+        if token not in token_clients:
             # Wait up to 10 seconds to see if any clients connect
-            loop = asyncio.get_running_loop()
-            wait_start = loop.time()
-            while loop.time() - wait_start < 10:
-                if token in self._token_clients and self._token_clients[token]:
-                    break
-                await asyncio.sleep(0.1)
-            else:
+            ready = self._token_ready_events.get(token)
+            if ready:
+                try:
+                    await asyncio.wait_for(ready.wait(), timeout=10)
+                except asyncio.TimeoutError:
+                    pass
+            if token not in token_clients:
                 self._log.debug(
                     f"No valid clients for token after waiting 10s, refusing connection from {addr}"
                 )
@@ -667,23 +768,31 @@ class WSSocksServer(Relay):
     ):
         if not self._socks_wait_client:
             socks_port = self._tokens.get(token, None)
-            if socks_port:
-                lock = self._token_locks[token]
-                async with lock:
-                    if socks_port and (socks_port not in self._socks_tasks):
-                        self._socks_tasks[socks_port] = task = asyncio.create_task(
-                            self._run_socks_server(
-                                token, socks_port, ready_event=ready_event
-                            )
-                        )
-                        return task
+            if socks_port and socks_port > 0:
+                return self._ensure_socks_server(token, socks_port, ready_event)
+
+    def _ensure_socks_server(
+        self, token: str, socks_port: int, ready_event: Optional[asyncio.Event] = None
+    ) -> asyncio.Task:
+        """Start the SOCKS server for a port unless it is already running"""
+
+        # No lock needed: the lookup and the insert are not separated by an await
+        task = self._socks_tasks.get(socks_port)
+        if task is None:
+            task = self._socks_tasks[socks_port] = asyncio.create_task(
+                self._run_socks_server(token, socks_port, ready_event=ready_event)
+            )
+        return task
 
     async def _handle_websocket(self, websocket: ServerConnection) -> None:
         """Handle WebSocket connection"""
         client_id = None
         token = None
         socks_port = None
-        internal_token = None
+        tokens = self._tokens
+        forward_tokens = self._forward_tokens
+        connector_tokens = self._connector_tokens
+        log = self._log
 
         try:
             req_path = getattr(websocket, "_path", "")
@@ -703,19 +812,22 @@ class WSSocksServer(Relay):
 
                 # Try to resolve raw_token against known tokens (plain or sha256)
                 resolved_token: Optional[str] = None
-                all_tokens: set[str] = (
-                    set(self._tokens.keys())
-                    | self._forward_tokens
-                    | set(self._connector_tokens.keys())
-                )
-
-                for t in all_tokens:
-                    if raw_token == t:
-                        resolved_token = t
-                        break
-                    if raw_token == hashlib.sha256(t.encode()).hexdigest():
-                        resolved_token = t
-                        break
+                if (
+                    raw_token in tokens
+                    or raw_token in forward_tokens
+                    or raw_token in connector_tokens
+                ):
+                    resolved_token = raw_token
+                else:
+                    all_tokens: set[str] = (
+                        set(tokens.keys())
+                        | forward_tokens
+                        | set(connector_tokens.keys())
+                    )
+                    for t in all_tokens:
+                        if raw_token == hashlib.sha256(t.encode()).hexdigest():
+                            resolved_token = t
+                            break
 
                 if not resolved_token:
                     await websocket.close(1008, "Invalid token")
@@ -738,7 +850,7 @@ class WSSocksServer(Relay):
                         await websocket.close(1008, "Invalid auth message")
                         return
                 except Exception as e:
-                    self._log.error(f"Failed to parse auth message: {e}")
+                    log.error(f"Failed to parse auth message: {e}")
                     await websocket.close(1008, "Invalid auth message")
                     return
                 else:
@@ -749,10 +861,11 @@ class WSSocksServer(Relay):
                 instance = auth_msg.instance
 
             # Validate token and generate client_id only after successful authentication
-            if reverse and token in self._tokens:  # reverse proxy
+            if reverse:
+                socks_port = tokens.get(token)
+
+            if socks_port is not None:  # reverse proxy
                 client_id = uuid4()
-                socks_port = self._tokens[token]
-                lock = self._token_locks[token]
 
                 # For tokens with allow_manage_connector, generate a unique internal token
                 if self._token_options.get(
@@ -766,64 +879,43 @@ class WSSocksServer(Relay):
                     self._internal_tokens[token].append(internal_token)
 
                     # Set up the internal token
-                    self._token_indexes[internal_token] = 0
                     self._token_options[internal_token] = self._token_options[token]
-                    self._tokens[internal_token] = (
-                        -1
-                    )  # Use -1 to indicate no SOCKS port
-                    self._token_locks[internal_token] = asyncio.Lock()
-
-                    # Initialize token clients list
-                    if internal_token not in self._token_clients:
-                        self._token_clients[internal_token] = []
-                    self._token_clients[internal_token].append((client_id, websocket))
+                    tokens[internal_token] = -1  # Use -1 to indicate no SOCKS port
+
+                    self._add_token_client(internal_token, client_id, websocket)
                 else:
-                    internal_token = token
-                    async with lock:
-                        if internal_token not in self._token_clients:
-                            self._token_clients[internal_token] = []
-                        self._token_clients[internal_token].append(
-                            (client_id, websocket)
-                        )
+                    self._add_token_client(token, client_id, websocket)
 
                 # Ensure SOCKS server is running
-                if socks_port not in self._socks_tasks and socks_port > 0:
-                    self._socks_tasks[socks_port] = asyncio.create_task(
-                        self._run_socks_server(token, socks_port)
-                    )
+                if socks_port > 0:
+                    self._ensure_socks_server(token, socks_port)
 
                 self._clients[client_id] = websocket
-                response_msg = AuthResponseMessage(success=True, error=None)
-                self.log_message(response_msg, "send")
-                await websocket.send(pack_message(response_msg))
-                self._log.info(f"Reverse client {client_id} authenticated")
+                self.log_message(_AUTH_SUCCESS_MSG, "send")
+                await websocket.send(_AUTH_SUCCESS_DATA)
+                log.info(f"Reverse client {client_id} authenticated")
 
-            elif not reverse and token in self._forward_tokens:  # forward proxy
+            elif not reverse and token in forward_tokens:  # forward proxy
                 client_id = uuid4()
                 self._forward_clients[client_id] = websocket
-                response_msg = AuthResponseMessage(success=True, error=None)
-                self.log_message(response_msg, "send")
-                await websocket.send(pack_message(response_msg))
-                self._log.info(f"Forward client {client_id} authenticated")
+                self.log_message(_AUTH_SUCCESS_MSG, "send")
+                await websocket.send(_AUTH_SUCCESS_DATA)
+                log.info(f"Forward client {client_id} authenticated")
 
-            elif not reverse and token in self._connector_tokens:  # connector proxy
+            elif not reverse and token in connector_tokens:  # connector proxy
                 client_id = uuid4()
 
                 # Add to token clients
-                if token not in self._token_clients:
-                    self._token_clients[token] = []
-                self._token_clients[token].append((client_id, websocket))
+                self._add_token_client(token, client_id, websocket)
 
                 self._clients[client_id] = websocket
-                response_msg = AuthResponseMessage(success=True, error=None)
-                self.log_message(response_msg, "send")
-                await websocket.send(pack_message(response_msg))
-                self._log.info(f"Connector client {client_id} authenticated")
+                self.log_message(_AUTH_SUCCESS_MSG, "send")
+                await websocket.send(_AUTH_SUCCESS_DATA)
+                log.info(f"Connector client {client_id} authenticated")
 
             else:
-                response_msg = AuthResponseMessage(success=False, error="Invalid token")
-                self.log_message(response_msg, "send")
-                await websocket.send(pack_message(response_msg))
+                self.log_message(_AUTH_INVALID_MSG, "send")
+                await websocket.send(_AUTH_INVALID_DATA)
                 await websocket.close(1008, "Invalid token")
                 return
 
@@ -834,9 +926,9 @@ class WSSocksServer(Relay):
             ]
 
             # Add appropriate message dispatcher
-            if token in self._connector_tokens:
+            if token in connector_tokens:
                 # Use connector message dispatcher for connector clients
-                reverse_token = self._connector_tokens[token]
+                reverse_token = connector_tokens[token]
                 tasks.append(
                     asyncio.create_task(
                         self._connector_message_dispatcher(
@@ -859,46 +951,34 @@ class WSSocksServer(Relay):
                         task.result()
                     except Exception as e:
                         if not isinstance(e, asyncio.CancelledError):
-                            self._log.error(
+                            log.error(
                                 f"Task failed with error: {e.__class__.__name__}: {e}."
                             )
             finally:
                 for task in tasks:
                     task.cancel()
-                await asyncio.gather(*tasks, return_exceptions=True)
+                await wait_tasks(tasks)
 
         except Exception as e:
-            self._log.error(f"WebSocket processing error: {e.__class__.__name__}: {e}.")
+            log.error(f"WebSocket processing error: {e.__class__.__name__}: {e}.")
         finally:
             if client_id:
-                self._log.info(f"Client {client_id} disconnected.")
+                log.info(f"Client {client_id} disconnected.")
             else:
-                self._log.info(f"Client (unauthenticated) disconnected.")
-            await self._cleanup_connection(client_id, internal_token or token)
+                log.info(f"Client (unauthenticated) disconnected.")
+            await self._cleanup_connection(client_id)
 
-    async def _cleanup_connection(
-        self, client_id: Optional[UUID], token: Optional[str]
-    ) -> None:
+    async def _cleanup_connection(self, client_id: Optional[UUID]) -> None:
         """Clean up resources without closing SOCKS server"""
 
-        if not client_id or not token:
+        if not client_id:
             return
 
         # Clean up _token_clients
-        if token in self._token_clients:
-            self._token_clients[token] = [
-                (cid, ws) for cid, ws in self._token_clients[token] if cid != client_id
-            ]
-
-            # Clean up resources if no connections left for this token
-            if not self._token_clients[token]:
-                del self._token_clients[token]
-                if token in self._token_indexes:
-                    del self._token_indexes[token]
+        self._remove_token_client(client_id)
 
         # Clean up _clients
-        if client_id in self._clients:
-            del self._clients[client_id]
+        self._clients.pop(client_id, None)
 
         self._log.debug(f"Cleaned up resources for client {client_id}.")
 
@@ -933,9 +1013,8 @@ class WSSocksServer(Relay):
         try:
             while True:
                 try:
-                    msg_data = await asyncio.wait_for(
-                        websocket.recv(), timeout=60
-                    )  # 60 seconds timeout
+                    # Dead connections are detected by the _ws_heartbeat task
+                    msg_data = await websocket.recv()
 
                     if not isinstance(msg_data, bytes):
                         self._log.warning("Received non-binary message, ignoring")
@@ -992,14 +1071,6 @@ class WSSocksServer(Relay):
                             await target_ws.send(pack_message(msg))
                         await self._conn_cache.remove_channel(msg.channel_id)
 
-                except asyncio.TimeoutError:
-                    try:
-                        await websocket.ping()
-                    except:
-                        self._log.warning(
-                            f"Connection timeout for connector client {client_id}"
-                        )
-                        break
                 except ConnectionClosed:
                     self._log.info(f"Connector client {client_id} connection closed.")
                     break
@@ -1014,133 +1085,144 @@ class WSSocksServer(Relay):
     ) -> None:
         """WebSocket message receiver distributing messages to different message queues"""
 
-        network_handler_tasks = set()  # Track network connection handler tasks
+        # Track network connection handler tasks
+        network_handler_tasks = self._network_handler_tasks[client_id] = set()
+
+        # Bind per-message lookups to locals once for the receive loop
+        recv = websocket.recv
+        handlers = self._msg_handlers
+        log_message = self.log_message
+        log = self._log
 
         try:
             while True:
                 try:
-                    msg_data = await asyncio.wait_for(
-                        websocket.recv(), timeout=60
-                    )  # 60 seconds timeout
+                    # Dead connections are detected by the _ws_heartbeat task
+                    msg_data = await recv()
 
                     if not isinstance(msg_data, bytes):
-                        self._log.warning("Received non-binary message, ignoring")
+                        log.warning("Received non-binary message, ignoring")
                         continue
 
                     try:
                         msg = parse_message(msg_data)
                     except Exception as e:
-                        self._log.error(f"Failed to parse message: {e}")
+                        log.error(f"Failed to parse message: {e}")
                         continue
                     else:
-                        self.log_message(msg, "recv")
+                        log_message(msg, "recv")
 
-                    if isinstance(msg, DataMessage):
-                        channel_id = str(msg.channel_id)
-                        if channel_id in self._message_queues:
-                            await self._message_queues[channel_id].put(msg)
-                        else:
-                            target_ws = await self._conn_cache.get_connector(
-                                msg.channel_id
-                            )
-                            if target_ws:
-                                self.log_message(msg, "send")
-                                await target_ws.send(pack_message(msg))
-                            else:
-                                self._log.debug(
-                                    f"Received data for unknown channel: {channel_id}"
-                                )
-                    elif isinstance(msg, ConnectResponseMessage):
-                        connect_id = str(msg.channel_id)
-                        if connect_id in self._message_queues:
-                            await self._message_queues[connect_id].put(msg)
-                        else:
-                            target_ws = await self._conn_cache.get_connector(
-                                msg.channel_id
-                            )
-                            if target_ws:
-                                self.log_message(msg, "send")
-                                await target_ws.send(pack_message(msg))
-                    elif (
-                        isinstance(msg, ConnectMessage)
-                        and client_id in self._forward_clients
-                    ):
-                        self._message_queues[str(msg.channel_id)] = asyncio.Queue()
-                        handler_task = asyncio.create_task(
-                            self._handle_network_connection(websocket, msg)
-                        )
-                        network_handler_tasks.add(handler_task)
-                        handler_task.add_done_callback(network_handler_tasks.discard)
-                    elif isinstance(msg, DisconnectMessage):
-                        self.disconnect_channel(str(msg.channel_id))
-                    elif isinstance(msg, ConnectorMessage):
-                        # Find the token for this client
-                        client_token = None
-                        for token, clients in self._token_clients.items():
-                            for cid, _ in clients:
-                                if cid == client_id:
-                                    client_token = token
-                                    break
-                            if client_token:
-                                break
-
-                        # Check permissions
-                        has_permission = False
-                        if client_token and client_token in self._token_options:
-                            has_permission = self._token_options[
-                                client_token
-                            ].allow_manage_connector
-
-                        response = ConnectorResponseMessage(
-                            success=False,
-                            channel_id=msg.channel_id,
-                            connector_token=None,
-                        )
-
-                        if has_permission:
-                            if msg.operation == "add":
-                                new_token = self.add_connector_token(
-                                    msg.connector_token, client_token
-                                )
-                                if new_token:
-                                    response.success = True
-                                    response.connector_token = new_token
-                                else:
-                                    response.error = "Failed to add connector token"
-                            elif msg.operation == "remove":
-                                if self.remove_token(msg.connector_token):
-                                    response.success = True
-                                else:
-                                    response.error = "Failed to remove connector token"
-                            else:
-                                response.error = (
-                                    f"Unknown connector operation: {msg.operation}"
-                                )
-                        else:
-                            response.error = "Unauthorized connector management attempt"
+                    handler = handlers.get(type(msg))
+                    if handler:
+                        await handler(websocket, client_id, msg)
 
-                        self.log_message(response, "send")
-                        await websocket.send(pack_message(response))
-
-                except asyncio.TimeoutError:
-                    # If 60 seconds pass without receiving messages, check if connection is still alive
-                    try:
-                        await websocket.ping()
-                    except:
-                        self._log.warning(f"Connection timeout for client {client_id}")
-                        break
                 except ConnectionClosed:
-                    self._log.info(f"Client {client_id} connection closed.")
+                    log.info(f"Client {client_id} connection closed.")
                     break
         except Exception as e:
-            self._log.error(
+            log.error(
                 f"WebSocket receive error for client {client_id}: {e.__class__.__name__}: {e}."
             )
         finally:
             # Cancel all active network connection handler tasks
+            del self._network_handler_tasks[client_id]
             for task in network_handler_tasks:
                 task.cancel()
-            await asyncio.gather(*network_handler_tasks, return_exceptions=True)
+            await wait_tasks(network_handler_tasks)
+
+    async def _handle_data_message(
+        self, websocket: ServerConnection, client_id: UUID, msg: DataMessage
+    ) -> None:
+        """Route data to the local channel, or to the connector owning the channel"""
+
+        channel_id = str(msg.channel_id)
+        if channel_id in self._message_queues:
+            await self._message_queues[channel_id].put(msg)
+        else:
+            target_ws = await self._conn_cache.get_connector(msg.channel_id)
+            if target_ws:
+                self.log_message(msg, "send")
+                await target_ws.send(pack_message(msg))
+            else:
+                self._log.debug(f"Received data for unknown channel: {channel_id}")
+
+    async def _handle_connect_response_message(
+        self,
+        websocket: ServerConnection,
+        client_id: UUID,
+        msg: ConnectResponseMessage,
+    ) -> None:
+        """Route a connect response to the waiting request, or to the connector"""
+
+        connect_id = str(msg.channel_id)
+        if connect_id in self._message_queues:
+            await self._message_queues[connect_id].put(msg)
+        else:
+            target_ws = await self._conn_cache.get_connector(msg.channel_id)
+            if target_ws:
+                self.log_message(msg, "send")
+                await target_ws.send(pack_message(msg))
+
+    async def _handle_connect_message(
+        self, websocket: ServerConnection, client_id: UUID, msg: ConnectMessage
+    ) -> None:
+        """Start a network connection requested by a forward proxy client"""
+
+        if client_id not in self._forward_clients:
+            return
+
+        self._message_queues[str(msg.channel_id)] = asyncio.Queue()
+        create_tracked_task(
+            self._handle_network_connection(websocket, msg),
+            self._network_handler_tasks[client_id],
+        )
+
+    async def _handle_disconnect_message(
+        self, websocket: ServerConnection, client_id: UUID, msg: DisconnectMessage
+    ) -> None:
+        """Close a channel on request of the client"""
+
+        self.disconnect_channel(str(msg.channel_id))
+
+    async def _handle_connector_message(
+        self, websocket: ServerConnection, client_id: UUID, msg: ConnectorMessage
+    ) -> None:
+        """Add or remove a connector token on request of a reverse client"""
+
+        # Find the token for this client
+        client_token = self._client_token.get(client_id)
+
+        # Check permissions
+        has_permission = False
+        if client_token and client_token in self._token_options:
+            has_permission = self._token_options[client_token].allow_manage_connector
+
+        response = ConnectorResponseMessage(
+            success=False,
+            channel_id=msg.channel_id,
+            connector_token=None,
+        )
+
+        if has_permission:
+            if msg.operation == "add":
+                new_token = self.add_connector_token(msg.connector_token, client_token)
+                if new_token:
+                    response.success = True
+                    response.connector_token = new_token
+                else:
+                    response.error = "Failed to add connector token"
+            elif msg.operation == "remove":
+                if self.remove_token(msg.connector_token):
+                    response.success = True
+                else:
+                    response.error = "Failed to remove connector token"
+            else:
+                response.error = f"Unknown connector operation: {msg.operation}"
+        else:
+            response.error = "Unauthorized connector management attempt"
+
+        self.log_message(response, "send")
+        await websocket.send(pack_message(response))
 
     async def _run_socks_server(
         self, token: str, socks_port: int, ready_event: Optional[asyncio.Event] = None
@@ -1148,38 +1230,36 @@ class WSSocksServer(Relay):
         """SOCKS server startup function"""
 
         socks_handler_tasks = set()  # Track SOCKS request handler tasks
+        accept_tasks = []  # One accept loop for each socket bound to the port
 
         try:
-            socks_server = await self._socket_manager.get_socket(socks_port)
+            socks_servers = await self._socket_manager.get_sockets(socks_port)
             self._log.info(
                 f"SOCKS5 server socket allocated on {self._socks_host}:{socks_port}"
             )
 
-            loop = asyncio.get_event_loop()
+            for socks_server in socks_servers:
+                accept_tasks.append(
+                    asyncio.create_task(
+                        self._accept_socks_connections(
+                            socks_server, token, socks_handler_tasks
+                        )
+                    )
+                )
             if ready_event:
                 ready_event.set()
-            while True:
-                try:
-                    client_sock, addr = await loop.sock_accept(socks_server)
-                    self._log.debug(f"Accepted SOCKS5 connection from {addr}.")
-                    handler_task = asyncio.create_task(
-                        self._handle_socks_request(client_sock, addr, token)
-                    )
-                    socks_handler_tasks.add(handler_task)
-                    handler_task.add_done_callback(socks_handler_tasks.discard)
-                except Exception as e:
-                    self._log.error(
-                        f"Error accepting SOCKS connection: {e.__class__.__name__}: {e}"
-                    )
+            await asyncio.gather(*accept_tasks)
         except Exception as e:
             self._log.error(f"SOCKS server error: {e}")
         except asyncio.CancelledError:
             pass
         finally:
-            # Cancel all active SOCKS request handler tasks
+            # Stop accepting and cancel all active SOCKS request handler tasks
+            for task in accept_tasks:
+                task.cancel()
             for task in socks_handler_tasks:
                 task.cancel()
-            await asyncio.gather(*socks_handler_tasks, return_exceptions=True)
+            await wait_tasks([*accept_tasks, *socks_handler_tasks])
 
             # Release the socket (starts grace period)
             await self._socket_manager.release_socket(socks_port)
@@ -1187,6 +1267,25 @@ class WSSocksServer(Relay):
                 f"SOCKS5 server released on {self._socks_host}:{socks_port}."
             )
 
+    async def _accept_socks_connections(
+        self, socks_server: socket.socket, token: str, socks_handler_tasks: set
+    ) -> None:
+        """Accept SOCKS connections from a single listening socket"""
+
+        sock_accept = self._loop.sock_accept
+        while True:
+            try:
+                client_sock, addr = await sock_accept(socks_server)
+                self._log.debug(f"Accepted SOCKS5 connection from {addr}.")
+                create_tracked_task(
+                    self._handle_socks_request(client_sock, addr, token),
+                    socks_handler_tasks,
+                )
+            except Exception as e:
+                self._log.error(
+                    f"Error accepting SOCKS connection: {e.__class__.__name__}: {e}"
+                )
+
     async def _process_request(self, connection: ServerConnection, request: Request):
         """Process HTTP requests before WebSocket handshake"""
 
@@ -1,5 +1,7 @@
 import asyncio
 import contextlib
+import gc
+import importlib.util
 from typing import Iterable
 import logging
 import pytest
@@ -160,6 +162,40 @@ def test_import():
     from pywssocks import WSSocksClient, WSSocksServer, PortPool
 
 
+def test_generated_tokens():
+    from pywssocks import WSSocksServer
+
+    server = WSSocksServer(socks_port_pool=[get_free_port()])
+    forward_token = server.add_forward_token()
+    reverse_token, _ = server.add_reverse_token()
+    connector_token = server.add_connector_token(reverse_token=reverse_token)
+    tokens = {forward_token, reverse_token, connector_token}
+    assert len(tokens) == 3
+    assert all(len(t) == 16 for t in tokens)
+
+
+def test_wait_tasks(caplog):
+    from pywssocks.common import wait_tasks
+
+    async def _failing():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            raise RuntimeError("teardown failure")
+
+    async def _main():
+        task = asyncio.create_task(_failing())
+        await asyncio.sleep(0)
+        task.cancel()
+        await wait_tasks([task])
+        await wait_tasks([])
+        assert task.done() and not task.cancelled()
+
+    asyncio.run(_main())
+    gc.collect()
+    assert "never retrieved" not in caplog.text
+
+
 def test_website(website):
     assert_web_connection(website)
 
@@ -604,6 +640,61 @@ def test_socket_manager_reuse(caplog, website):
     return asyncio.run(asyncio.wait_for(_main(), 30))
 
 
+@pytest.mark.skipif(
+    not hasattr(socket, "SO_REUSEPORT"), reason="SO_REUSEPORT is not available"
+)
+def test_socket_manager_workers(caplog):
+    from pywssocks.server import SocketManager
+
+    async def _main():
+        loop = asyncio.get_running_loop()
+        port = get_free_port()
+        manager = SocketManager("127.0.0.1", grace=1, workers=2)
+        try:
+            socks = await manager.get_sockets(port)
+            assert len(socks) == 2
+            assert all(sock.getsockname()[1] == port for sock in socks)
+
+            # A socket without SO_REUSEPORT still gets a port conflict
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as other:
+                with pytest.raises(OSError):
+                    other.bind(("127.0.0.1", port))
+
+            # The kernel spreads incoming connections across the sockets
+            accepted = [0] * len(socks)
+
+            async def _accept(idx):
+                while True:
+                    conn, _ = await loop.sock_accept(socks[idx])
+                    conn.close()
+                    accepted[idx] += 1
+
+            accept_tasks = [asyncio.create_task(_accept(i)) for i in range(len(socks))]
+            for _ in range(20):
+                with socket.create_connection(("127.0.0.1", port)):
+                    pass
+            while sum(accepted) < 20:
+                await asyncio.sleep(0.05)
+            for task in accept_tasks:
+                task.cancel()
+            await asyncio.wait(accept_tasks)
+            assert all(accepted)
+
+            # Sockets released within the grace period are reused as a whole
+            await manager.release_socket(port)
+            assert await manager.get_sockets(port) is socks
+
+            # And closed together once the grace period expires
+            await manager.release_socket(port)
+            await asyncio.sleep(1.5)
+            assert port not in manager._sockets
+            assert all(sock.fileno() == -1 for sock in socks)
+        finally:
+            await manager.close()
+
+    return asyncio.run(asyncio.wait_for(_main(), 30))
+
+
 def test_connector(caplog, website):
     """Test basic connector functionality"""
 
@@ -659,3 +750,46 @@ def test_connector_autonomy(caplog, website):
                         await async_assert_web_connection(website, socks_port)
 
     return asyncio.run(asyncio.wait_for(_main(), 30))
+
+
+def run_with_uvloop(main):
+    from pywssocks.common import install_uvloop
+
+    policy = asyncio.get_event_loop_policy()
+    try:
+        assert install_uvloop()
+        return asyncio.run(asyncio.wait_for(main(), 30))
+    finally:
+        asyncio.set_event_loop_policy(policy)
+
+
+needs_uvloop = pytest.mark.skipif(
+    importlib.util.find_spec("uvloop") is None, reason="uvloop is not installed"
+)
+
+
+@needs_uvloop
+def test_reverse_uvloop(caplog, website):
+    async def _main():
+        async with reverse_proxy() as (server, client, socks_port):
+            await async_assert_web_connection(website, socks_port)
+
+    return run_with_uvloop(_main)
+
+
+@needs_uvloop
+def test_forward_udp_uvloop(caplog, udp_server):
+    async def _main():
+        async with forward_proxy() as (server, client, socks_port):
+            await async_assert_udp_connection(udp_server, socks_port)
+
+    return run_with_uvloop(_main)
+
+
+@needs_uvloop
+def test_reverse_udp_uvloop(caplog, udp_server):
+    async def _main():
+        async with reverse_proxy() as (server, client, socks_port):
+            await async_assert_udp_connection(udp_server, socks_port)
+
+    return run_with_uvloop(_main)